@@ -0,0 +1,490 @@
+"""Asyncio entry point: serve the blog app and run its refreshes on one event loop
+
+    uvicorn asgi:application --host 0.0.0.0 --port $PORT
+
+Upstream fetches go through one httpx.AsyncClient, and the scheduler and
+refresh job runner are tasks on the loop. Blog generation is CPU-bound, so
+it runs in a single worker thread. The home page is served straight from
+the loop because it only picks a prebuilt body. Server-sent events are
+native coroutines, so an idle subscriber holds no thread. Other routes run
+the Flask app in a thread pool, so a slow archive query never holds up the
+loop.
+
+The threaded app:app entry point is unchanged, and the two share
+app.py's caches, source state and blog store. Leader election works the
+same way, so several uvicorn workers can share BLOG_STORE_PATH. With
+STREAM_MLB_PAYLOAD the reports are parsed as they download, so those
+refreshes run entirely in the generation thread with the threaded fetcher.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import asyncio
+import io
+import os
+import random
+import sys
+import time
+
+import httpx
+
+import app as blog_app
+
+# Flask requests that may block (archive reads, first builds of projections)
+REQUEST_THREADS = 16
+request_executor = ThreadPoolExecutor(max_workers=REQUEST_THREADS, thread_name_prefix='request')
+
+# Refreshes run one at a time, so one thread is enough for generation
+generation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='generate')
+
+# Routes that only pick a prebuilt body, served on the loop without a thread hop
+INLINE_ROUTES = frozenset(['/', '/health'])
+
+EVENTS_ROUTE = '/api/blogs/events'
+
+# Set up in lifespan startup
+event_loop = None
+http_client = None
+
+# Replaced every time a snapshot is installed, so waiters grab the current one
+# and are woken by the next install
+snapshot_event = asyncio.Event()
+
+# Held while a source is being fetched, like app.source_locks for the loop
+source_locks = {name: asyncio.Lock() for name in blog_app.UPSTREAMS}
+
+# Strong references to running background tasks, so they aren't collected
+background_tasks = set()
+
+def start_task(coro):
+    """Run a coroutine in the background, reporting it if it dies"""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(finish_task)
+    return task
+
+def finish_task(task):
+    background_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        print(f"❌ Background task failed: {task.exception()!r}")
+
+def run_in(executor, function, *args):
+    """Run a blocking function in an executor without blocking the loop"""
+    return event_loop.run_in_executor(executor, function, *args)
+
+def announce_snapshot():
+    """Wake everything waiting on the loop for a new snapshot"""
+    global snapshot_event
+    
+    snapshot_event.set()
+    snapshot_event = asyncio.Event()
+
+def on_snapshot_installed(snapshot):
+    """Snapshot listener; runs on whichever thread installed the snapshot"""
+    event_loop.call_soon_threadsafe(announce_snapshot)
+
+async def wait_for_snapshot(timeout, *also):
+    """Wait up to timeout seconds for the next snapshot, or until a task in also finishes
+    
+    Returns True if a snapshot was installed.
+    """
+    waiter = asyncio.ensure_future(snapshot_event.wait())
+    try:
+        done, _ = await asyncio.wait((waiter, *also), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+    return waiter in done
+
+# Upstream fetching
+
+def create_http_client():
+    """Build the shared keep-alive client used for every upstream call"""
+    connect_timeout, read_timeout = blog_app.FETCH_TIMEOUT
+    transport = httpx.AsyncHTTPTransport(
+        retries=blog_app.FETCH_RETRIES,
+        limits=httpx.Limits(max_connections=4 * len(blog_app.UPSTREAMS), max_keepalive_connections=len(blog_app.UPSTREAMS))
+    )
+    return httpx.AsyncClient(timeout=httpx.Timeout(read_timeout, connect=connect_timeout), transport=transport)
+
+async def get_with_retries(url, headers):
+    """Async twin of app.get_with_retries: retry retryable statuses until the fetch deadline
+    
+    The transport retries connect errors only, like the threaded session.
+    """
+    deadline = time.monotonic() + blog_app.FETCH_DEADLINE_SECONDS
+    attempt = 0
+    while True:
+        connect_timeout, read_timeout = blog_app.attempt_timeout(deadline)
+        response = await http_client.get(url, headers=headers, timeout=httpx.Timeout(read_timeout, connect=connect_timeout))
+        delay = blog_app.retry_delay(attempt, response.status_code, deadline)
+        if delay is None:
+            break
+        await asyncio.sleep(delay)
+        attempt += 1
+    
+    # httpx treats every non-2xx as an error, but a 304 is our cache hit
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+async def fetch_json(source):
+    """Async twin of app.fetch_json, returning (data, changed)"""
+    blog_app.check_circuit(source)
+    try:
+        with blog_app.STAGE_SECONDS.time(stage=f"fetch_{source}"):
+            response = await get_with_retries(blog_app.UPSTREAMS[source], blog_app.conditional_headers(source))
+        # Hashing and parsing a large payload would stall the loop
+        return await asyncio.to_thread(
+            blog_app.store_fetch_response, source, response.status_code, response.headers, response.content
+        )
+    except Exception:
+        blog_app.record_fetch_result(source, False)
+        blog_app.UPSTREAM_FETCHES.inc(source=source, result='error')
+        raise
+
+async def refresh_source(source):
+    """Async twin of app.refresh_source: fetch now, keeping the last good payload on failure"""
+    state = blog_app.source_state[source]
+    async with source_locks[source]:
+        try:
+            print(f"🌐 Fetching {source} data...")
+            data, changed = await fetch_json(source)
+            print(f"✅ Got new {source} data" if changed else f"💤 {source} data unchanged")
+        except Exception as e:
+            if state['data'] is None:
+                print(f"❌ Error fetching {source} data: {e}")
+            else:
+                print(f"⚠️ Error fetching {source} data, keeping the last good copy: {e}")
+        return state['data'], state['version']
+
+def revalidate_in_background(source):
+    """Refresh a source in a task, queueing a refresh if it changed"""
+    state = blog_app.source_state[source]
+    if state['revalidating']:
+        return
+    state['revalidating'] = True
+    
+    async def revalidate():
+        version = state['version']
+        try:
+            await refresh_source(source)
+        finally:
+            state['revalidating'] = False
+        if state['version'] != version:
+            print(f"🔁 {source} data changed while revalidating, queueing a refresh")
+            await asyncio.to_thread(blog_app.submit_refresh, 'lineup-umpire')
+    
+    start_task(revalidate())
+
+async def get_source(source, force=False):
+    """Async twin of app.get_source, returning (data, version)"""
+    result = blog_app.lookup_source(source, force)
+    if result == 'stale':
+        revalidate_in_background(source)
+    if result != 'miss':
+        state = blog_app.source_state[source]
+        return state['data'], state['version']
+    return await refresh_source(source)
+
+async def fetch_all_sources(force=False):
+    """Get MLB and umpire data concurrently, fetching only the sources that are due
+    
+    Returns (mlb_reports, umpires, changed) like app.fetch_all_sources.
+    """
+    (mlb_data, mlb_version), (umpires, umpire_version) = await asyncio.gather(
+        get_source('mlb', force), get_source('umpires', force)
+    )
+    applied = blog_app.applied_source_versions
+    changed = mlb_version != applied.get('mlb') or umpire_version != applied.get('umpires')
+    applied.update(mlb=mlb_version, umpires=umpire_version)
+    return (mlb_data or {}).get('reports', []), umpires, changed
+
+# Refreshes
+
+async def generate_all_blogs():
+    """Full refresh: fetch on the loop, generate in the generation thread"""
+    if blog_app.STREAM_MLB_PAYLOAD:
+        await run_in(generation_executor, blog_app.generate_all_blogs)
+        return
+    
+    print(f"🚀 Full blog generation at {datetime.now()}")
+    mlb_reports, umpires, _ = await fetch_all_sources(force=True)
+    await run_in(generation_executor, blog_app.build_all_blogs, mlb_reports, umpires)
+
+async def update_lineup_and_umpire_data():
+    """Lineup and umpire refresh: fetch what is due on the loop, regenerate in the generation thread"""
+    if not blog_app.current_snapshot.blogs:
+        print("📝 No existing blogs to update, running full generation")
+        await generate_all_blogs()
+        return
+    if not blog_app.slate_is_current(datetime.now(blog_app.SLATE_TIMEZONE)):
+        print("📅 Blogs are not today's slate, running full generation")
+        await generate_all_blogs()
+        return
+    if blog_app.STREAM_MLB_PAYLOAD:
+        await run_in(generation_executor, blog_app.update_lineup_and_umpire_data)
+        return
+    
+    print(f"🔄 Updating lineup and umpire data at {datetime.now()}")
+    mlb_reports, umpires, changed = await fetch_all_sources()
+    await run_in(generation_executor, blog_app.apply_lineup_and_umpire_data, mlb_reports, umpires, changed)
+
+def wait_for_refresh_job():
+    """Block until a job is queued in this process, or the store poll interval passes"""
+    blog_app.refresh_wakeup.wait(blog_app.STORE_POLL_SECONDS)
+    blog_app.refresh_wakeup.clear()
+
+async def run_refresh_jobs():
+    """Leader task: run queued refresh jobs one at a time"""
+    refresh_functions = {
+        'full': generate_all_blogs,
+        'lineup-umpire': update_lineup_and_umpire_data
+    }
+    
+    while True:
+        job = await asyncio.to_thread(blog_app.blog_store.claim_next_job, datetime.now().isoformat())
+        if job is None:
+            await asyncio.to_thread(wait_for_refresh_job)
+            continue
+        
+        print(f"🏃 Running {job['kind']} refresh job {job['id']}")
+        try:
+            await refresh_functions[job['kind']]()
+            await asyncio.to_thread(
+                blog_app.blog_store.update_job, job['id'], status='succeeded', finished_at=datetime.now().isoformat()
+            )
+        except Exception as e:
+            print(f"❌ Refresh job {job['id']} failed: {e}")
+            await asyncio.to_thread(
+                blog_app.blog_store.update_job, job['id'], status='failed', error=str(e), finished_at=datetime.now().isoformat()
+            )
+
+async def run_scheduler():
+    """Sleep until the next deadline, then queue that refresh; a new snapshot means re-plan"""
+    while True:
+        now = datetime.now(blog_app.SLATE_TIMEZONE)
+        when, kind = blog_app.plan_next_refresh(now, blog_app.slate_start_times(now), blog_app.slate_is_current(now))
+        delay = (when - now).total_seconds() + random.uniform(0, blog_app.SCHEDULE_JITTER_SECONDS)
+        print(f"⏰ Next {kind} refresh at {when:%Y-%m-%d %H:%M %Z}")
+        
+        if await wait_for_snapshot(min(delay, blog_app.MAX_SCHEDULER_SLEEP_SECONDS)):
+            continue
+        if delay <= blog_app.MAX_SCHEDULER_SLEEP_SECONDS:
+            await asyncio.to_thread(blog_app.submit_refresh, kind)
+
+async def run_worker_loop():
+    """Async twin of app.run_worker_loop: follow the store until elected, then lead"""
+    while not blog_app.try_become_leader():
+        try:
+            await asyncio.to_thread(blog_app.sync_from_store)
+        except Exception as e:
+            print(f"❌ Error reading blog store: {e}")
+        await asyncio.sleep(blog_app.STORE_POLL_SECONDS)
+    
+    print(f"👑 Worker {os.getpid()} is the refresh leader")
+    await asyncio.to_thread(blog_app.sync_from_store)
+    
+    # Jobs a previous leader was running died with it
+    await asyncio.to_thread(blog_app.blog_store.fail_running_jobs, 'Refresh leader restarted', datetime.now().isoformat())
+    start_task(run_refresh_jobs())
+    
+    await asyncio.to_thread(blog_app.submit_refresh, 'full')
+    await run_scheduler()
+
+# Serving
+
+async def read_body(receive):
+    """Read a whole request body"""
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+async def wait_for_disconnect(receive):
+    """Return once the client has gone away"""
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+def build_environ(scope, body):
+    """Translate an ASGI HTTP scope into a WSGI environ for the Flask app"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    for name, value in scope['headers']:
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = f"HTTP_{key}"
+        value = value.decode('latin-1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+async def call_flask(scope, receive, send, inline):
+    """Serve a request with the Flask app, on the loop when inline, else in the request pool"""
+    environ = build_environ(scope, await read_body(receive))
+    started = {}
+    
+    def start_response(status, headers, exc_info=None):
+        started['status'] = int(status.split(' ', 1)[0])
+        started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+    
+    if inline:
+        result = blog_app.app(environ, start_response)
+    else:
+        result = await run_in(request_executor, blog_app.app, environ, start_response)
+    
+    # Streamed bodies (?stream=1) are pulled a chunk at a time, off the loop unless inline
+    chunks = iter(result)
+    try:
+        await send({'type': 'http.response.start', 'status': started['status'], 'headers': started['headers']})
+        while True:
+            chunk = next(chunks, None) if inline else await run_in(request_executor, next, chunks, None)
+            if chunk is None:
+                break
+            if chunk:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+
+def pending_changes(seen):
+    """Change log entries newer than version seen"""
+    with blog_app.snapshot_published:
+        return [entry for entry in blog_app.change_log if entry['version'] > seen]
+
+async def blog_events(scope, receive, send):
+    """Async twin of app.api_blog_events: one compact event per published snapshot
+    
+    Each subscriber is a coroutine waiting on the loop, so an idle one costs
+    no thread.
+    """
+    started = time.perf_counter()
+    last_event_id = dict(scope['headers']).get(b'last-event-id')
+    try:
+        seen = int(last_event_id)
+    except (TypeError, ValueError):
+        seen = blog_app.current_snapshot.version
+    
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no')
+        ]
+    })
+    blog_app.REQUEST_SECONDS.observe(time.perf_counter() - started, route=EVENTS_ROUTE)
+    blog_app.RESPONSES.inc(route=EVENTS_ROUTE, status=200)
+    
+    async def send_text(text):
+        await send({'type': 'http.response.body', 'body': text.encode('utf-8'), 'more_body': True})
+    
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send_text(f"retry: 5000\n: version {blog_app.current_snapshot.version}\n\n")
+        deadline = event_loop.time() + blog_app.SSE_MAX_SECONDS
+        
+        while not disconnected.done() and event_loop.time() < deadline:
+            pending = pending_changes(seen)
+            if not pending:
+                await wait_for_snapshot(
+                    min(blog_app.SSE_HEARTBEAT_SECONDS, max(0, deadline - event_loop.time())), disconnected
+                )
+                pending = pending_changes(seen)
+            if disconnected.done():
+                break
+            
+            if not pending:
+                await send_text(": keepalive\n\n")
+                continue
+            for entry in pending:
+                await send_text(blog_app.format_sse_event(entry))
+                seen = entry['version']
+        
+        if not disconnected.done():
+            await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        disconnected.cancel()
+
+async def startup():
+    """Load shared data, then follow or lead refreshes on the loop"""
+    global event_loop, http_client
+    
+    print("🚀 Initializing MLB Blog Service (asyncio)")
+    event_loop = asyncio.get_running_loop()
+    http_client = create_http_client()
+    blog_app.snapshot_listeners.append(on_snapshot_installed)
+    
+    await asyncio.to_thread(blog_app.sync_from_store)
+    # Serve the last persisted snapshot until the leader's first refresh lands
+    if not blog_app.current_snapshot.blogs:
+        await asyncio.to_thread(blog_app.load_snapshot_file)
+    
+    start_task(run_worker_loop())
+    print("✅ Background worker started")
+
+async def shutdown():
+    """Stop background tasks and close the upstream client"""
+    for task in list(background_tasks):
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    blog_app.snapshot_listeners.remove(on_snapshot_installed)
+    await http_client.aclose()
+
+async def lifespan(receive, send):
+    """Run startup and shutdown for the ASGI lifespan protocol"""
+    await receive()
+    try:
+        await startup()
+    except Exception as e:
+        await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+        return
+    await send({'type': 'lifespan.startup.complete'})
+    
+    await receive()
+    await shutdown()
+    await send({'type': 'lifespan.shutdown.complete'})
+
+async def application(scope, receive, send):
+    """ASGI application"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        # No websocket routes
+        await send({'type': 'websocket.close'})
+        return
+    
+    if scope['path'] == EVENTS_ROUTE and scope['method'] == 'GET':
+        await blog_events(scope, receive, send)
+        return
+    
+    inline = (
+        scope['path'] in INLINE_ROUTES and not scope['query_string'] and scope['method'] in ('GET', 'HEAD')
+        # A page showing yesterday's date is re-rendered, so off the loop
+        and not (scope['path'] == '/' and (
+            blog_app.STREAM_HOME_PAGE or blog_app.current_snapshot.page.get('date') != blog_app.page_date()
+        ))
+    )
+    await call_flask(scope, receive, send, inline)
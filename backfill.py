@@ -0,0 +1,222 @@
+"""Regenerate historical days from recorded upstream payloads into the daily archive
+
+    python backfill.py payloads/                          # every recorded day
+    python backfill.py payloads/ --start 2025-04-01 --end 2025-06-30
+    python backfill.py payloads/ --workers 8 --chunk-days 32
+    python backfill.py payloads/ --restart                # ignore the checkpoint
+
+The payload directory holds one MLB payload per day, named
+mlb-YYYY-MM-DD.json, and optionally umpires-YYYY-MM-DD.json. Either may be
+gzipped (.json.gz). Days are fanned out across a process pool. Each
+worker regenerates one day with generate_game_blog_data() and hands back
+only the compressed archive record, so a worker holds at most one day's
+payload. Workers are also replaced every MAX_DAYS_PER_WORKER days.
+
+Finished days are appended to ARCHIVE_DIR in chunks, with one fsync per
+chunk, and are then served by /api/blogs?date=. The checkpoint file
+(ARCHIVE_DIR/backfill-checkpoint.json by default) lists the days written
+so far. A rerun over the same payload directory skips those days, so an
+interrupted backfill resumes where it stopped. At worst it redoes one
+chunk, and for a date archived twice the later record wins.
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, datetime
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+import time
+
+# Backfills write only the archive, never a running service's shared store
+os.environ.pop('BLOG_STORE_PATH', None)
+
+import app as blog_app
+
+PAYLOAD_FILE = re.compile(r'^(mlb|umpires)-(\d{4}-\d{2}-\d{2})\.json(\.gz)?$')
+
+# Days a worker process regenerates before it is replaced, bounding its memory
+MAX_DAYS_PER_WORKER = 64
+
+# Days waiting on the pool per worker; enough to keep every core busy
+DAYS_IN_FLIGHT_PER_WORKER = 2
+
+def find_payloads(payload_dir, start=None, end=None):
+    """Map each recorded date in [start, end] to its (mlb_path, umpire_path or None)"""
+    found = {}
+    for name in os.listdir(payload_dir):
+        match = PAYLOAD_FILE.match(name)
+        if not match:
+            continue
+        source, day = match.group(1), date.fromisoformat(match.group(2))
+        if (start and day < start) or (end and day > end):
+            continue
+        found.setdefault(day, {})[source] = os.path.join(payload_dir, name)
+    return {
+        day: (paths['mlb'], paths.get('umpires'))
+        for day, paths in sorted(found.items())
+        if 'mlb' in paths
+    }
+
+def load_payload(path):
+    """Read a recorded payload, gzipped or not"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return json.loads(f.read())
+
+def recorded_at(path):
+    """When a payload was recorded, taken from its file's modification time"""
+    return datetime.fromtimestamp(os.path.getmtime(path)).isoformat() if path else None
+
+def backfill_day(archive_date, mlb_path, umpire_path):
+    """Worker: regenerate one day's blogs from its payloads
+    
+    Returns (date, record, games, errors); record is None when no game could
+    be generated, mirroring refreshes that never publish an empty slate.
+    """
+    reports = load_payload(mlb_path).get('reports', [])
+    umpires = load_payload(umpire_path) if umpire_path else []
+    umpire_index = blog_app.build_umpire_index(umpires)
+    
+    blogs = []
+    errors = 0
+    for report in reports:
+        try:
+            blogs.append(blog_app.generate_game_blog_data(report, umpire_index))
+        except Exception as e:
+            print(f"❌ Error generating blog for {report.get('matchup', 'Unknown')} on {archive_date}: {e}")
+            errors += 1
+    if not blogs:
+        return archive_date, None, 0, errors
+    
+    record = blog_app.encode_archive_record({
+        'date': archive_date.isoformat(),
+        'version': 0,
+        'last_updated': recorded_at(mlb_path),
+        'lineup_last_updated': recorded_at(mlb_path),
+        'umpires_last_updated': recorded_at(umpire_path),
+        'total_games': len(blogs),
+        'blogs': blogs
+    })
+    return archive_date, record, len(blogs), errors
+
+def read_checkpoint(path, payload_dir):
+    """Days already backfilled from payload_dir, per the checkpoint file"""
+    try:
+        with open(path, 'rb') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    if checkpoint.get('payload_dir') != payload_dir:
+        print(f"⚠️ Checkpoint {path} is for {checkpoint.get('payload_dir')}, starting over")
+        return set()
+    return {date.fromisoformat(day) for day in checkpoint.get('done', [])}
+
+def write_checkpoint(path, payload_dir, done):
+    """Record the finished days, replacing the checkpoint file atomically"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'payload_dir': payload_dir, 'done': sorted(day.isoformat() for day in done)}, f)
+    os.replace(tmp_path, path)
+
+def run_backfill(payload_dir, days, checkpoint_path, workers, chunk_days):
+    """Regenerate days across a process pool, archiving and checkpointing every chunk_days
+    
+    Returns (archived days, games, errors).
+    """
+    done = read_checkpoint(checkpoint_path, payload_dir)
+    pending = [(day, paths) for day, paths in days.items() if day not in done]
+    if len(pending) < len(days):
+        print(f"⏩ Skipping {len(days) - len(pending)} days already in the checkpoint")
+    print(f"🏗️ Backfilling {len(pending)} days with {workers} workers")
+    
+    archived = games = errors = 0
+    chunk = []
+    chunk_done = []
+    started = time.perf_counter()
+    
+    def flush():
+        nonlocal archived
+        if chunk:
+            blog_app.append_archive_records(chunk)
+            archived += len(chunk)
+        done.update(chunk_done)
+        write_checkpoint(checkpoint_path, payload_dir, done)
+        elapsed = time.perf_counter() - started
+        print(f"🗄️ {len(done)} of {len(days)} days done ({archived / elapsed:.1f} days/s)")
+        chunk.clear()
+        chunk_done.clear()
+    
+    queue = iter(pending)
+    in_flight = {}
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=MAX_DAYS_PER_WORKER) as executor:
+        while True:
+            # Submit a bounded window of days so results never pile up in the parent
+            for day, (mlb_path, umpire_path) in queue:
+                in_flight[executor.submit(backfill_day, day, mlb_path, umpire_path)] = day
+                if len(in_flight) >= workers * DAYS_IN_FLIGHT_PER_WORKER:
+                    break
+            if not in_flight:
+                break
+            
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                day = in_flight.pop(future)
+                try:
+                    day, record, day_games, day_errors = future.result()
+                except Exception as e:
+                    # Left out of the checkpoint, so the next run retries it
+                    print(f"❌ Error backfilling {day}: {e}")
+                    errors += 1
+                    continue
+                games += day_games
+                errors += day_errors
+                if record is None:
+                    print(f"⚠️ No games generated for {day}")
+                else:
+                    chunk.append((day, record))
+                chunk_done.append(day)
+            if len(chunk_done) >= chunk_days:
+                flush()
+    
+    if chunk_done:
+        flush()
+    return archived, games, errors
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenerate historical days from recorded payloads into the archive')
+    parser.add_argument('payload_dir', help='directory of mlb-YYYY-MM-DD.json[.gz] and umpires-YYYY-MM-DD.json[.gz] files')
+    parser.add_argument('--start', type=date.fromisoformat, help='first day to backfill (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, help='last day to backfill (YYYY-MM-DD)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes (default: one per core)')
+    parser.add_argument('--chunk-days', type=int, default=16, help='days archived per write and checkpoint')
+    parser.add_argument('--checkpoint', help='checkpoint file (default: ARCHIVE_DIR/backfill-checkpoint.json)')
+    parser.add_argument('--restart', action='store_true', help='ignore the checkpoint and redo every day')
+    args = parser.parse_args()
+    
+    payload_dir = os.path.abspath(args.payload_dir)
+    checkpoint_path = args.checkpoint or os.path.join(blog_app.ARCHIVE_DIR, 'backfill-checkpoint.json')
+    if args.restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    
+    days = find_payloads(payload_dir, args.start, args.end)
+    if not days:
+        print(f"❌ No MLB payloads found in {payload_dir}")
+        return 1
+    
+    started = time.perf_counter()
+    try:
+        archived, games, errors = run_backfill(payload_dir, days, checkpoint_path, args.workers, args.chunk_days)
+    except KeyboardInterrupt:
+        print(f"🛑 Interrupted; rerun to resume from {checkpoint_path}")
+        return 130
+    print(
+        f"✅ Backfilled {archived} days ({games} games, {errors} errors) "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,428 @@
+"""Benchmarks for the refresh and render paths, run against local upstream stand-ins
+
+    python bench.py                         # normal 15-game slate
+    python bench.py --scenario stress       # thousands of key_matchups per game
+    python bench.py --latency 0.2 --failure-rate 0.1 --failure-mode error
+    python bench.py --save-baseline         # record this machine's numbers
+    python bench.py --check                 # exit 1 if p50 regressed past --tolerance
+
+Each benchmark reports throughput, p50/p99 latency and tracemalloc peak
+memory, and is compared against bench_baselines.json when it has an entry
+for the scenario. Baselines are machine-specific, so re-record them before
+comparing on a new machine.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from contextlib import redirect_stdout
+from datetime import datetime
+import argparse
+import atexit
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BASE_DIR, 'bench_baselines.json')
+
+# Keep the app's snapshot file and archive out of the working tree, and use the in-process store
+bench_dir = tempfile.TemporaryDirectory(prefix='mlb-bench-')
+atexit.register(bench_dir.cleanup)
+os.environ['SNAPSHOT_PATH'] = os.path.join(bench_dir.name, 'snapshot.bin')
+os.environ['ARCHIVE_DIR'] = os.path.join(bench_dir.name, 'archive')
+os.environ.pop('BLOG_STORE_PATH', None)
+os.environ.pop('STREAM_HOME_PAGE', None)
+os.environ.pop('STREAM_MLB_PAYLOAD', None)
+
+import app as blog_app
+
+# Games, key_matchups per batting side and default iterations for each scenario
+SCENARIOS = {
+    'normal': {'games': 15, 'batters': 9, 'iterations': 20},
+    'large': {'games': 15, 'batters': 250, 'iterations': 5},
+    'stress': {'games': 30, 'batters': 500, 'iterations': 2},
+}
+
+TEAMS = [
+    'NYY', 'BOS', 'TOR', 'TB', 'BAL', 'CLE', 'DET', 'KC', 'MIN', 'CWS',
+    'HOU', 'SEA', 'TEX', 'LAA', 'OAK', 'ATL', 'NYM', 'PHI', 'MIA', 'WSH',
+    'CHC', 'STL', 'MIL', 'CIN', 'PIT', 'LAD', 'SD', 'SF', 'ARI', 'COL'
+]
+
+PITCHES = [
+    ('FF', 'Four-Seam'), ('SI', 'Sinker'), ('FC', 'Cutter'), ('SL', 'Slider'),
+    ('ST', 'Sweeper'), ('CU', 'Curveball'), ('CH', 'Changeup'), ('FS', 'Splitter')
+]
+
+RELIABILITY = ['HIGH', 'MEDIUM', 'LOW']
+
+FAILURE_MODES = ('error', 'malformed', 'reset')
+
+def synthetic_pitcher(rng, name):
+    arsenal = {}
+    for code, pitch_name in rng.sample(PITCHES, rng.randint(3, 6)):
+        arsenal[code] = {
+            'name': pitch_name,
+            'usage_rate': round(rng.random(), 3),
+            'avg_speed': round(78 + rng.random() * 21, 1)
+        }
+    return {'name': name, 'arsenal': arsenal}
+
+def synthetic_report(rng, game, batters):
+    """One game's report, shaped like the MLB matchup API's"""
+    today = datetime.now(blog_app.SLATE_TIMEZONE).date()
+    away, home = TEAMS[(2 * game) % len(TEAMS)], TEAMS[(2 * game + 1) % len(TEAMS)]
+    if game >= len(TEAMS) // 2:
+        # Past one full slate, play doubleheaders
+        away, home = home, away
+    away_pitcher, home_pitcher = f"Starter{game}, Away", f"Starter{game}, Home"
+    
+    key_matchups = []
+    for side, vs_pitcher in (('Away', home_pitcher), ('Home', away_pitcher)):
+        for batter in range(batters):
+            matchup = {
+                'batter': f"{side}{game}B{batter}, Hitter",
+                'vs_pitcher': vs_pitcher,
+                'reliability': rng.choice(RELIABILITY),
+                'weighted_est_ba': round(0.180 + rng.random() * 0.150, 3),
+                'weighted_k_rate': round(12 + rng.random() * 20, 1)
+            }
+            if rng.random() > 0.1:
+                matchup['baseline_stats'] = {
+                    'season_avg': round(0.200 + rng.random() * 0.110, 3),
+                    'season_k_pct': round(14 + rng.random() * 16, 1)
+                }
+            key_matchups.append(matchup)
+    
+    return {
+        'matchup': f"{away} @ {home}",
+        # Today's slate, so updates treat it as current; naive times are Eastern
+        'game_time': f"{today}T{13 + game % 10:02d}:{rng.choice(['05', '10', '35', '40'])}:00",
+        'pitchers': {
+            'away': synthetic_pitcher(rng, away_pitcher),
+            'home': synthetic_pitcher(rng, home_pitcher)
+        },
+        'key_matchups': key_matchups
+    }
+
+def synthetic_umpire(rng, matchup, game):
+    boost = lambda: f"{0.85 + rng.random() * 0.3:.2f}x"
+    return {
+        'umpire': f"Umpire {game}",
+        'matchup': matchup,
+        'k_boost': boost(),
+        'bb_boost': boost(),
+        'ba_boost': boost(),
+        'obp_boost': boost(),
+        'slg_boost': boost()
+    }
+
+def synthetic_slate(games, batters, seed=0):
+    """Build (mlb_payload, umpire_payload) for a slate"""
+    rng = random.Random(seed)
+    reports = [synthetic_report(rng, game, batters) for game in range(games)]
+    umpires = [synthetic_umpire(rng, report['matchup'], game) for game, report in enumerate(reports)]
+    return {'reports': reports}, umpires
+
+class Upstream:
+    """A local HTTP stand-in for one upstream API
+    
+    Serves a pre-encoded JSON payload with a strong ETag (honouring
+    If-None-Match), after a configurable latency, and fails a fraction of
+    requests: 'error' answers 500, 'malformed' sends truncated JSON and
+    'reset' drops the connection without answering.
+    """
+    
+    def __init__(self, latency=0.0, failure_rate=0.0, failure_mode='error', seed=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_mode = failure_mode
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.set_payload(None)
+        
+        upstream = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out as separate writes; don't let Nagle hold the body back
+            disable_nagle_algorithm = True
+            
+            def do_GET(self):
+                upstream.handle(self)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def set_payload(self, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self._payload = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+    
+    def handle(self, handler):
+        with self._lock:
+            self.requests += 1
+            failed = self._rng.random() < self.failure_rate
+        body, etag = self._payload
+        if self.latency:
+            time.sleep(self.latency)
+        
+        if failed and self.failure_mode == 'reset':
+            handler.close_connection = True
+            return
+        if failed and self.failure_mode == 'error':
+            handler.send_response(500)
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+            return
+        if failed and self.failure_mode == 'malformed':
+            body = body[:len(body) // 2]
+        elif handler.headers.get('If-None-Match') == etag:
+            handler.send_response(304)
+            handler.send_header('ETag', etag)
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+            return
+        
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('ETag', etag)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def reset_app_state():
+    """Forget fetched payloads, rendered cards and the current slate, as on a cold start"""
+    for state in blog_app.source_state.values():
+        state.update(etag=None, last_modified=None, body_hash=None, data=None, fetched_at=None, version=0)
+    blog_app.applied_source_versions.clear()
+    for breaker in blog_app.circuit_breakers.values():
+        breaker.update(failures=0, opened_at=None)
+    blog_app.card_cache.clear()
+    blog_app.current_snapshot = blog_app.build_snapshot(blog_app.current_snapshot.version, blog_app.EMPTY_STATE)
+
+def expire_sources(*sources):
+    """Make cached upstream payloads due, so the next update revalidates them"""
+    for source in sources or blog_app.UPSTREAMS:
+        blog_app.source_state[source]['fetched_at'] = None
+
+def tolerate_refresh_errors(refresh):
+    """Wrap a refresh so one that publishes nothing (as injected failures cause) is still timed"""
+    def run():
+        try:
+            refresh()
+        except blog_app.RefreshError:
+            pass
+    return run
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def measure(run, iterations, setup=None):
+    """Time run() iterations times, then trace one more run for peak memory"""
+    timings = []
+    with redirect_stdout(io.StringIO()):
+        for _ in range(iterations):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'ops_per_sec': iterations / sum(timings),
+        'p50_ms': percentile(timings, 0.50) * 1000,
+        'p99_ms': percentile(timings, 0.99) * 1000,
+        'peak_kib': peak / 1024
+    }
+
+def run_benchmarks(iterations, upstreams, mlb_payload, umpire_payload):
+    """Run every benchmark for one slate, returning results by benchmark name"""
+    mlb_upstream, umpire_upstream = upstreams
+    client = blog_app.app.test_client()
+    results = {}
+    
+    generate_all_blogs = tolerate_refresh_errors(blog_app.generate_all_blogs)
+    update_lineup_and_umpire_data = tolerate_refresh_errors(blog_app.update_lineup_and_umpire_data)
+    
+    def seed_slate():
+        reset_app_state()
+        with redirect_stdout(io.StringIO()):
+            generate_all_blogs()
+    
+    results['generate_all_blogs (cold)'] = measure(generate_all_blogs, iterations, setup=reset_app_state)
+    
+    seed_slate()
+    results['generate_all_blogs (unchanged)'] = measure(generate_all_blogs, iterations)
+    
+    # Rotate one game's umpire each run, so each update regenerates one game
+    rotation = {'game': 0}
+    def change_one_umpire():
+        umpires = [dict(umpire) for umpire in umpire_payload]
+        game = rotation['game'] = (rotation['game'] + 1) % len(umpires)
+        umpires[game]['k_boost'] = f"{0.85 + (rotation['game'] % 30) / 100:.2f}x"
+        umpires[game]['umpire'] = f"Umpire {game} ({time.perf_counter_ns()})"
+        umpire_upstream.set_payload(umpires)
+        expire_sources('umpires')
+    
+    results['update_lineup_and_umpire_data (one game)'] = measure(
+        update_lineup_and_umpire_data, iterations, setup=change_one_umpire
+    )
+    umpire_upstream.set_payload(umpire_payload)
+    
+    seed_slate()
+    results['update_lineup_and_umpire_data (unchanged)'] = measure(
+        update_lineup_and_umpire_data, iterations, setup=expire_sources
+    )
+    results['update_lineup_and_umpire_data (sources fresh)'] = measure(update_lineup_and_umpire_data, iterations)
+    
+    snapshot = blog_app.current_snapshot
+    render_cards = lambda: [blog_app.generate_game_html(blog) for blog in snapshot.blogs]
+    results['generate_game_html (every card, cold)'] = measure(render_cards, iterations, setup=blog_app.card_cache.clear)
+    results['generate_game_html (every card, cached)'] = measure(render_cards, iterations)
+    results['generate_games_html'] = measure(lambda: blog_app.generate_games_html(snapshot), iterations)
+    results['render_home_page'] = measure(lambda: blog_app.render_home_page(snapshot), iterations)
+    
+    request_iterations = iterations * 20
+    etag = client.get('/', headers={'Accept-Encoding': 'br, gzip'}).headers['ETag']
+    for name, path, headers in (
+        ('index (br)', '/', {'Accept-Encoding': 'br, gzip'}),
+        ('index (304)', '/', {'Accept-Encoding': 'br, gzip', 'If-None-Match': etag}),
+        ('index (stream, gzip)', '/?stream=1', {'Accept-Encoding': 'gzip'}),
+        ('api_blogs (gzip)', '/api/blogs', {'Accept-Encoding': 'gzip'}),
+    ):
+        def request_page(path=path, headers=headers):
+            response = client.get(path, headers=headers)
+            response.get_data()
+            response.close()
+        results[name] = measure(request_page, request_iterations)
+    
+    return results
+
+def compare(results, baseline, tolerance):
+    """Print results against a baseline, returning the benchmarks that regressed"""
+    regressions = []
+    print(f"{'benchmark':<44}{'ops/s':>10}{'p50 ms':>11}{'p99 ms':>11}{'peak KiB':>11}{'vs base':>10}")
+    for name, result in results.items():
+        base = (baseline or {}).get(name)
+        versus = ''
+        if base:
+            ratio = result['p50_ms'] / base['p50_ms'] if base['p50_ms'] else 1.0
+            versus = f"{ratio:.2f}x"
+            if ratio > 1 + tolerance:
+                versus += ' ⚠️'
+                regressions.append(name)
+        print(
+            f"{name:<44}{result['ops_per_sec']:>10.1f}{result['p50_ms']:>11.3f}"
+            f"{result['p99_ms']:>11.3f}{result['peak_kib']:>11.0f}{versus:>10}"
+        )
+    return regressions
+
+def load_baselines():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH) as f:
+        return json.load(f)
+
+def save_baselines(baselines):
+    with open(BASELINE_PATH, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark blog generation and page rendering')
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='normal')
+    parser.add_argument('--games', type=int, help='games in the slate (overrides the scenario)')
+    parser.add_argument('--batters', type=int, help='key_matchups per batting side (overrides the scenario)')
+    parser.add_argument('--iterations', type=int, help='runs per benchmark (default depends on the scenario)')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds each upstream waits before answering')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fraction of upstream requests that fail')
+    parser.add_argument('--failure-mode', choices=FAILURE_MODES, default='error')
+    parser.add_argument('--stream-mlb', action='store_true', help='parse the MLB payload as it streams (STREAM_MLB_PAYLOAD=1)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the scenario baseline')
+    parser.add_argument('--check', action='store_true', help='exit 1 if any p50 regressed past the tolerance')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p50 slowdown before flagging (0.25 = 25%%)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = dict(SCENARIOS[args.scenario])
+    if args.games:
+        config['games'] = args.games
+    if args.batters:
+        config['batters'] = args.batters
+    if args.iterations:
+        config['iterations'] = args.iterations
+    
+    mlb_payload, umpire_payload = synthetic_slate(config['games'], config['batters'], args.seed)
+    upstreams = (
+        Upstream(args.latency, args.failure_rate, args.failure_mode, args.seed),
+        Upstream(args.latency, args.failure_rate, args.failure_mode, args.seed + 1)
+    )
+    upstreams[0].set_payload(mlb_payload)
+    upstreams[1].set_payload(umpire_payload)
+    blog_app.UPSTREAMS.update(mlb=upstreams[0].url, umpires=upstreams[1].url)
+    blog_app.STREAM_MLB_PAYLOAD = args.stream_mlb
+    
+    # Baselines only apply to the scenario as defined and to healthy upstreams
+    custom = args.games or args.batters or args.latency or args.failure_rate
+    key = None if custom else f"{args.scenario}+stream" if args.stream_mlb else args.scenario
+    
+    print(
+        f"📊 {args.scenario}: {config['games']} games, {2 * config['batters']} key_matchups per game, "
+        f"{config['iterations']} iterations, latency {args.latency}s, "
+        f"failure rate {args.failure_rate} ({args.failure_mode}){', streamed MLB parse' if args.stream_mlb else ''}"
+    )
+    try:
+        results = run_benchmarks(config['iterations'], upstreams, mlb_payload, umpire_payload)
+    finally:
+        for upstream in upstreams:
+            upstream.close()
+    
+    baselines = load_baselines()
+    regressions = compare(results, baselines.get(key), args.tolerance)
+    print(f"🌐 Upstream requests: mlb {upstreams[0].requests}, umpires {upstreams[1].requests}")
+    
+    if args.save_baseline:
+        if key is None:
+            print("❌ Not saving a baseline for a customized run")
+            return 2
+        baselines[key] = results
+        save_baselines(baselines)
+        print(f"💾 Saved {key} baseline to {BASELINE_PATH}")
+    
+    if regressions:
+        print(f"⚠️ {len(regressions)} benchmarks slower than baseline by more than {args.tolerance:.0%}")
+        if args.check:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
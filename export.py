@@ -0,0 +1,188 @@
+"""Export the current slate as a static site that any static file server or CDN can serve
+
+    python export.py site/                  # refresh from the upstream APIs, then export
+    python export.py site/ --from-snapshot  # export the service's last published snapshot as is
+    python export.py site/ --full           # force a full refresh first
+    python export.py site/ --force          # rewrite every file, changed or not
+
+The tree mirrors the app's routes: index.html, game/<slug>/index.html,
+api/blogs.json and api/blogs/<slug>.json. Each file gets precompressed
+.gz and .br siblings for servers that serve them directly (nginx
+gzip_static/brotli_static, Caddy's precompressed). manifest.json maps
+every file to the SHA-256 of its content.
+
+Exports are incremental. A file whose hash matches the previous manifest
+is neither recompressed nor rewritten, and files of games that left the
+slate are removed. Like the scheduler, a run does a full refresh only when
+there is no slate for today yet, and otherwise updates lineups and
+umpires. Games that didn't change keep byte-identical files.
+
+Refreshes never touch a running service's files. They use an in-process
+store instead of BLOG_STORE_PATH, and keep their own snapshot file
+(site.snapshot.bin next to site/ by default) instead of SNAPSHOT_PATH.
+They also never append to ARCHIVE_DIR. --from-snapshot reads
+SNAPSHOT_PATH.
+"""
+from datetime import datetime
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+# Exports never publish into a running service's shared store or archive
+os.environ.pop('BLOG_STORE_PATH', None)
+os.environ['ARCHIVE_SNAPSHOTS'] = '0'
+
+import app as blog_app
+
+MANIFEST_NAME = 'manifest.json'
+
+# Sibling suffix for each precompressed encoding, and the ones we can build
+ENCODING_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+# Exports are offline, so compress at the highest level the live app skips
+EXPORT_BROTLI_QUALITY = 11
+EXPORT_ENCODINGS = ['gzip', 'br'] if blog_app.brotli is not None else ['gzip']
+
+def refresh_snapshot(full=False):
+    """Bring the snapshot up to date: a full refresh for a new slate day, else a lineup/umpire update"""
+    blog_app.load_snapshot_file()
+    snapshot = blog_app.current_snapshot
+    today = datetime.now(blog_app.SLATE_TIMEZONE).date()
+    if full or not snapshot.blogs or blog_app.slate_date(snapshot) != today:
+        blog_app.generate_all_blogs()
+    else:
+        blog_app.update_lineup_and_umpire_data()
+
+def export_files(snapshot):
+    """Yield (path, body) for each file of the static tree"""
+    yield 'index.html', blog_app.home_page(snapshot)['bodies']['identity']
+    yield 'api/blogs.json', blog_app.dumps_json(blog_app.api_blogs_payload(snapshot, (), ()))
+    for key in snapshot.fragments:
+        slug = blog_app.game_slug(key)
+        yield f"game/{slug}/index.html", blog_app.game_page_body(snapshot, key)
+        yield f"api/blogs/{slug}.json", blog_app.dumps_json(blog_app.game_payload(snapshot, key))
+
+def read_manifest(out_dir):
+    """Files of the previous export, or {} if there is none"""
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'rb') as f:
+            return json.load(f).get('files', {})
+    except (OSError, ValueError):
+        return {}
+
+def write_file(path, body):
+    """Write a file atomically, so a server never sends a partial one"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(body)
+    os.replace(tmp_path, path)
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def is_current(out_dir, path, entry, previous):
+    """Whether a file and its siblings are already on disk with this content"""
+    old = previous.get(path)
+    if old is None or old['sha256'] != entry['sha256'] or old['encodings'] != entry['encodings']:
+        return False
+    full_path = os.path.join(out_dir, path)
+    return all(
+        os.path.exists(full_path + suffix)
+        for suffix in [''] + [ENCODING_SUFFIXES[encoding] for encoding in entry['encodings']]
+    )
+
+def export_site(snapshot, out_dir, force=False):
+    """Write a snapshot's static tree to out_dir, touching only files that changed
+    
+    Returns (written, unchanged, removed) file counts.
+    """
+    previous = {} if force else read_manifest(out_dir)
+    files = {}
+    written = unchanged = 0
+    
+    for path, body in export_files(snapshot):
+        entry = {
+            'sha256': hashlib.sha256(body).hexdigest(),
+            'bytes': len(body),
+            'encodings': EXPORT_ENCODINGS
+        }
+        files[path] = entry
+        if is_current(out_dir, path, entry, previous):
+            unchanged += 1
+            continue
+        
+        bodies = blog_app.compress_body(body, brotli_quality=EXPORT_BROTLI_QUALITY)
+        full_path = os.path.join(out_dir, path)
+        for encoding, suffix in ENCODING_SUFFIXES.items():
+            if encoding in entry['encodings']:
+                write_file(full_path + suffix, bodies[encoding])
+            else:
+                # A sibling left from an earlier export would be stale
+                remove_file(full_path + suffix)
+        write_file(full_path, body)
+        written += 1
+    
+    removed = 0
+    for path in read_manifest(out_dir):
+        if path in files:
+            continue
+        full_path = os.path.join(out_dir, path)
+        for suffix in [''] + list(ENCODING_SUFFIXES.values()):
+            remove_file(full_path + suffix)
+        # Drop the game's directory once it is empty
+        try:
+            os.removedirs(os.path.dirname(full_path))
+        except OSError:
+            pass
+        removed += 1
+    
+    # The manifest goes last, so it only ever lists files that are in place
+    manifest = {
+        'version': snapshot.version,
+        'last_updated': blog_app.isoformat_or_none(blog_app.snapshot_last_modified(snapshot)),
+        'exported_at': datetime.now().isoformat(),
+        'files': files
+    }
+    write_file(os.path.join(out_dir, MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return written, unchanged, removed
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the current slate as a static site')
+    parser.add_argument('out_dir', help='directory to write the static tree to')
+    parser.add_argument('--from-snapshot', action='store_true', help='export SNAPSHOT_PATH without fetching')
+    parser.add_argument('--snapshot', help="the export's own snapshot file (default: <out_dir>.snapshot.bin)")
+    parser.add_argument('--full', action='store_true', help='run a full refresh instead of a lineup/umpire update')
+    parser.add_argument('--force', action='store_true', help='rewrite every file, even unchanged ones')
+    args = parser.parse_args()
+    
+    out_dir = os.path.abspath(args.out_dir)
+    if args.from_snapshot:
+        blog_app.load_snapshot_file()
+    else:
+        # Warm-start from and publish to the export's snapshot, not the service's
+        blog_app.SNAPSHOT_PATH = os.path.abspath(args.snapshot or f"{out_dir}.snapshot.bin")
+        try:
+            refresh_snapshot(full=args.full)
+        except blog_app.RefreshError as e:
+            print(f"❌ Refresh failed: {e}")
+            return 1
+    
+    snapshot = blog_app.current_snapshot
+    if not snapshot.blogs:
+        print("❌ No blogs to export")
+        return 1
+    
+    written, unchanged, removed = export_site(snapshot, out_dir, force=args.force)
+    print(
+        f"📦 Exported version {snapshot.version} ({snapshot.games_count} games) to {out_dir}: "
+        f"{written} files written, {unchanged} unchanged, {removed} removed"
+    )
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
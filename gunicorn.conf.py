@@ -0,0 +1,14 @@
+# gunicorn.conf.py - picked up automatically by `gunicorn app:app`
+import os
+
+# Workers share blogs through this SQLite file; one of them is elected to refresh it
+os.environ.setdefault('BLOG_STORE_PATH', '/tmp/mlb-blog-store.sqlite3')
+
+# Threaded workers, so a server-sent events subscriber ties up one thread rather
+# than the whole worker; app.SSE_MAX_SUBSCRIBERS stays below this
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+def post_worker_init(worker):
+    from app import initialize_app
+    initialize_app()
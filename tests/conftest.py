@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Keep the app's snapshot file and archive out of the working tree, and use the in-process store
+test_dir = tempfile.TemporaryDirectory(prefix='mlb-tests-')
+os.environ['SNAPSHOT_PATH'] = os.path.join(test_dir.name, 'snapshot.bin')
+os.environ['ARCHIVE_DIR'] = os.path.join(test_dir.name, 'archive')
+os.environ.pop('BLOG_STORE_PATH', None)
+os.environ.pop('STREAM_HOME_PAGE', None)
+os.environ.pop('STREAM_MLB_PAYLOAD', None)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as blog_app
+
+def make_report(matchup, game_time):
+    """A minimal report, shaped like the MLB matchup API's"""
+    away_pitcher, home_pitcher = 'Away, Starter', 'Home, Starter'
+    arsenal = {'FF': {'name': '4-Seam Fastball', 'usage_rate': 0.6, 'avg_speed': 95.1}}
+    return {
+        'matchup': matchup,
+        'game_time': game_time,
+        'pitchers': {
+            'away': {'name': away_pitcher, 'arsenal': arsenal},
+            'home': {'name': home_pitcher, 'arsenal': arsenal}
+        },
+        'key_matchups': [
+            {
+                'batter': f"{side}, Hitter",
+                'vs_pitcher': vs_pitcher,
+                'reliability': 'HIGH',
+                'weighted_est_ba': 0.275,
+                'weighted_k_rate': 20.5,
+                'baseline_stats': {'season_avg': 0.260, 'season_k_pct': 22.0}
+            }
+            for side, vs_pitcher in (('Away', home_pitcher), ('Home', away_pitcher))
+        ]
+    }
+
+@pytest.fixture
+def client():
+    return blog_app.app.test_client()
+
+@pytest.fixture(autouse=True)
+def empty_slate():
+    """Start each test from an empty slate and API cache"""
+    blog_app.install_state(blog_app.current_snapshot.version, blog_app.EMPTY_STATE)
+    blog_app.api_cache['version'] = None
+    yield
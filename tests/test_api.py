@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from conftest import blog_app, make_report
+
+def test_range_with_live_day_filters_games(client):
+    """The live day's GameBlogs and archived dicts both filter by ?game="""
+    blog_app.build_all_blogs([
+        make_report('NYY @ BOS', '2026-10-17T19:10:00'),
+        make_report('LAD @ SF', '2026-10-17T22:10:00')
+    ], [])
+    today = blog_app.slate_date(blog_app.current_snapshot)
+    yesterday = today - timedelta(days=1)
+    blog_app.append_archive_records([(yesterday, blog_app.encode_archive_record({
+        'date': yesterday.isoformat(),
+        'version': 0,
+        'last_updated': None,
+        'lineup_last_updated': None,
+        'umpires_last_updated': None,
+        'total_games': 2,
+        'blogs': [{'matchup': 'NYY @ BOS'}, {'matchup': 'TEX @ HOU'}]
+    }))])
+    
+    response = client.get(f"/api/blogs?start={yesterday}&end={today}&game=nyy-at-bos")
+    
+    assert response.status_code == 200
+    days = response.get_json()['days']
+    assert [day['date'] for day in days] == [yesterday.isoformat(), today.isoformat()]
+    assert [[blog['matchup'] for blog in day['blogs']] for day in days] == [['NYY @ BOS'], ['NYY @ BOS']]
+
+def test_range_with_live_day_projects_fields(client):
+    blog_app.build_all_blogs([make_report('NYY @ BOS', '2026-10-17T19:10:00')], [])
+    today = blog_app.slate_date(blog_app.current_snapshot)
+    
+    response = client.get(f"/api/blogs?start={today}&end={today}&game=NYY @ BOS&fields=matchup")
+    
+    assert response.status_code == 200
+    assert response.get_json()['days'][0]['blogs'] == [{'matchup': 'NYY @ BOS'}]
@@ -0,0 +1,81 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+
+from conftest import blog_app
+
+import asgi
+
+class SlowUpstream(BaseHTTPRequestHandler):
+    """Answers every request after a delay: with the next queued status, then 200"""
+    delay = 0.0
+    statuses = []
+    requests_seen = 0
+    
+    def do_GET(self):
+        type(self).requests_seen += 1
+        time.sleep(self.delay)
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = b'{"reports": []}'
+        try:
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except BrokenPipeError:
+            # The client timed out and hung up
+            pass
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def upstream(monkeypatch):
+    SlowUpstream.delay, SlowUpstream.statuses, SlowUpstream.requests_seen = 0.0, [], 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowUpstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(blog_app, 'FETCH_DEADLINE_SECONDS', 1.0)
+    monkeypatch.setattr(blog_app, 'FETCH_BACKOFF_FACTOR', 0.1)
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+def async_get(url):
+    async def get():
+        asgi.http_client = asgi.create_http_client()
+        try:
+            return await asgi.get_with_retries(url, {})
+        finally:
+            await asgi.http_client.aclose()
+    return asyncio.run(get())
+
+def test_statuses_are_retried(upstream):
+    SlowUpstream.statuses = [503, 502]
+    assert blog_app.get_with_retries(upstream).status_code == 200
+    SlowUpstream.statuses = [503, 502]
+    assert async_get(upstream).status_code == 200
+    assert SlowUpstream.requests_seen == 6
+
+@pytest.mark.parametrize('get', [blog_app.get_with_retries, async_get], ids=['threaded', 'asyncio'])
+def test_slow_failures_stop_at_the_deadline(upstream, get):
+    SlowUpstream.delay = 0.4
+    SlowUpstream.statuses = [503] * 10
+    started = time.monotonic()
+    with pytest.raises(Exception):
+        get(upstream)
+    # Two slow 503s fit in the deadline; a third would overrun it
+    assert time.monotonic() - started < blog_app.FETCH_DEADLINE_SECONDS + 0.5
+    assert SlowUpstream.requests_seen == 2
+
+@pytest.mark.parametrize('get', [blog_app.get_with_retries, async_get], ids=['threaded', 'asyncio'])
+def test_read_timeouts_are_not_retried(upstream, monkeypatch, get):
+    monkeypatch.setattr(blog_app, 'FETCH_TIMEOUT', (1, 0.3))
+    SlowUpstream.delay = 0.6
+    # requests reports it as retries exhausted, httpx as a ReadTimeout
+    with pytest.raises((requests.exceptions.ConnectionError, asgi.httpx.ReadTimeout)):
+        get(upstream)
+    assert SlowUpstream.requests_seen == 1
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+from conftest import blog_app, make_report
+
+TZ = blog_app.SLATE_TIMEZONE
+
+def at(hour, minute=0, day=17):
+    return datetime(2026, 10, day, hour, minute, tzinfo=TZ)
+
+def test_overnight_plans_the_morning_full_refresh():
+    assert blog_app.plan_next_refresh(at(3), [at(19, 10)]) == (at(6), 'full')
+    assert blog_app.plan_next_refresh(at(3), [], slate_ready=False) == (at(6), 'full')
+
+def test_missing_slate_retries_with_backoff():
+    plans = [blog_app.plan_next_refresh(now, [], slate_ready=False) for now in (at(6), at(6, 15), at(6, 30), at(7), at(12))]
+    assert plans == [
+        (at(6, 15), 'full'),
+        (at(6, 30), 'full'),
+        (at(7), 'full'),
+        (at(8), 'full'),
+        (at(13), 'full')
+    ]
+
+def test_lineup_refreshes_follow_the_slate():
+    start_times = [at(13, 5), at(19, 10)]
+    # Hourly until the first lineup window opens
+    assert blog_app.plan_next_refresh(at(8), start_times) == (at(9), 'lineup-umpire')
+    assert blog_app.plan_next_refresh(at(9, 30), start_times) == (at(10, 5), 'lineup-umpire')
+    # Every few minutes inside a lineup window
+    assert blog_app.plan_next_refresh(at(11), start_times) == (at(11) + blog_app.PREGAME_REFRESH_INTERVAL, 'lineup-umpire')
+    # Nothing after the last first pitch but tomorrow's full refresh
+    assert blog_app.plan_next_refresh(at(20), start_times) == (at(6, day=18), 'full')
+
+def test_start_times_ignore_other_days(monkeypatch):
+    reports = [make_report('NYY @ BOS', '2026-10-16T19:10:00'), make_report('LAD @ SF', '2026-10-17T22:10:00')]
+    monkeypatch.setitem(blog_app.source_state['mlb'], 'data', {'reports': reports})
+    assert blog_app.slate_start_times(at(12)) == [at(22, 10)]
+    
+    monkeypatch.setitem(blog_app.source_state['mlb'], 'data', {'reports': reports[:1]})
+    assert blog_app.slate_start_times(at(12)) == []
+
+def test_slate_is_current_uses_game_dates():
+    today = datetime.now(TZ)
+    yesterday = today - timedelta(days=1)
+    assert not blog_app.slate_is_current(today)
+    
+    # A refresh today that republishes yesterday's feed is not today's slate
+    blog_app.build_all_blogs([make_report('NYY @ BOS', f"{yesterday.date()}T19:10:00")], [])
+    assert blog_app.slate_date(blog_app.current_snapshot) == yesterday.date()
+    assert not blog_app.slate_is_current(today)
+    when, kind = blog_app.plan_next_refresh(today.replace(hour=12), [], blog_app.slate_is_current(today))
+    assert (when - today.replace(hour=12), kind) == (blog_app.IDLE_REFRESH_INTERVAL, 'full')
+    
+    blog_app.build_all_blogs([make_report('NYY @ BOS', f"{today.date()}T19:10:00")], [])
+    assert blog_app.slate_is_current(today)
+
+def test_slate_without_game_times_dates_from_publish():
+    report = make_report('NYY @ BOS', None)
+    blog_app.build_all_blogs([report], [])
+    assert blog_app.current_snapshot.game_date is None
+    assert blog_app.slate_is_current(datetime.now(TZ))